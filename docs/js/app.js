@@ -3,6 +3,7 @@
  * 所有计算在浏览器端完成，无需后端。
  */
 let eqChart=null, prChart=null, rsiCh=null;
+const CLOCK_FMT=new Intl.DateTimeFormat('zh-CN',{year:'numeric',month:'numeric',day:'numeric',hour:'numeric',minute:'numeric',second:'numeric',hour12:false});
 
 document.addEventListener('DOMContentLoaded',()=>{
     initNav(); initClock();
@@ -22,17 +23,22 @@ function initNav(){
 }
 
 // ── 时钟 ──
+// 工作日每分钟的市场状态(下标=时*60+分)，每秒只需查表
+const MKT_STATUS=['盘前','交易中','午休','已收盘'];
+const MKT_BY_MIN=new Uint8Array(1440).map((_,m)=>{
+    const h=m/60|0,mi=m%60;
+    return (h>=9&&h<11)||(h===11&&mi<=30)||(h>=13&&h<15)?1:h<9?0:h>=15?3:2;
+});
+
 function initClock(){
     const tick=()=>{
         const now=new Date();
         const bj=new Date(now.getTime()+(now.getTimezoneOffset()+480)*60000);
-        const h=bj.getHours(),d=bj.getDay();
-        const trading=(d>=1&&d<=5)&&((h>=9&&h<11)||(h===11&&bj.getMinutes()<=30)||(h>=13&&h<15));
+        const d=bj.getDay();
         const badge=document.getElementById('mkt-st');
         if(d===0||d===6){badge.textContent='休市';badge.className='badge rd';}
-        else if(trading){badge.textContent='交易中';badge.className='badge gn';}
-        else{badge.textContent=h<9?'盘前':h>=15?'已收盘':'午休';badge.className='badge rd';}
-        document.getElementById('clock').textContent=bj.toLocaleString('zh-CN',{hour12:false});
+        else{const st=MKT_BY_MIN[bj.getHours()*60+bj.getMinutes()];badge.textContent=MKT_STATUS[st];badge.className=st===1?'badge gn':'badge rd';}
+        document.getElementById('clock').textContent=CLOCK_FMT.format(bj);
     };tick();setInterval(tick,1000);
 }
 
@@ -42,27 +48,34 @@ function doBT(){
     const syms=[];document.querySelectorAll('#sym-cb input:checked').forEach(c=>syms.push(c.value));
     if(syms.length===0){alert('请至少选择一个标的');btn.disabled=false;btn.textContent='🚀 运行回测';return;}
 
-    setTimeout(()=>{
-        try{
-            const result=runBacktest({
-                symbols:syms,
-                startDate:document.getElementById('bt-s').value,
-                endDate:document.getElementById('bt-e').value,
-                initialCapital:+document.getElementById('bt-cap').value,
-                signalThreshold:+document.getElementById('bt-th').value,
-                stopLossPct:+document.getElementById('bt-sl').value,
-                takeProfitPct:+document.getElementById('bt-tp').value,
-                maShort:+(document.getElementById('c-ms')?.value||10),
-                maLong:+(document.getElementById('c-ml')?.value||30),
-                rsiPeriod:+(document.getElementById('c-rp')?.value||14),
-                maWeight:(+(document.getElementById('c-mw')?.value||40))/100,
-                rsiWeight:(+(document.getElementById('c-rw')?.value||30))/100,
-                macdWeight:(+(document.getElementById('c-mcw')?.value||30))/100,
-            });
-            showBT(result);
-        }catch(e){alert('回测出错: '+e.message);}
-        btn.disabled=false;btn.textContent='🚀 运行回测';
-    },50);
+    runBacktestAsync({
+        symbols:syms,
+        startDate:document.getElementById('bt-s').value,
+        endDate:document.getElementById('bt-e').value,
+        initialCapital:+document.getElementById('bt-cap').value,
+        signalThreshold:+document.getElementById('bt-th').value,
+        stopLossPct:+document.getElementById('bt-sl').value,
+        takeProfitPct:+document.getElementById('bt-tp').value,
+        maShort:+(document.getElementById('c-ms')?.value||10),
+        maLong:+(document.getElementById('c-ml')?.value||30),
+        rsiPeriod:+(document.getElementById('c-rp')?.value||14),
+        maWeight:(+(document.getElementById('c-mw')?.value||40))/100,
+        rsiWeight:(+(document.getElementById('c-rw')?.value||30))/100,
+        macdWeight:(+(document.getElementById('c-mcw')?.value||30))/100,
+    }).then(showBT).catch(e=>alert('回测出错: '+e.message)).finally(()=>{btn.disabled=false;btn.textContent='🚀 运行回测';});
+}
+
+// 回测放到 Web Worker 执行，不阻塞页面；Worker 不可用时(如 file:// 打开)退回主线程
+let btWorker;
+function runBacktestAsync(params){
+    const runLocal=()=>new Promise(r=>setTimeout(r,50)).then(()=>runBacktest(params));
+    if(btWorker===undefined){try{btWorker=new Worker('js/bt_worker.js');}catch(e){btWorker=null;}}
+    if(!btWorker)return runLocal();
+    return new Promise((resolve,reject)=>{
+        btWorker.onmessage=e=>e.data.ok?resolve(e.data.result):reject(new Error(e.data.error));
+        btWorker.onerror=e=>{e.preventDefault();btWorker.terminate();btWorker=null;resolve(runLocal());};
+        btWorker.postMessage(params);
+    });
 }
 
 function showBT(r){
@@ -84,8 +97,9 @@ function showBT(r){
     const ctx=document.getElementById('eq-chart').getContext('2d');
     if(eqChart)eqChart.destroy();
     const step=Math.max(1,Math.floor(r.equityCurve.length/120));
-    const filtered=r.equityCurve.filter((_,i)=>i%step===0);
-    eqChart=new Chart(ctx,{type:'line',data:{labels:filtered.map(d=>d.date),datasets:[{label:'权益曲线',data:filtered.map(d=>d.equity),borderColor:'#6366f1',backgroundColor:'rgba(99,102,241,.08)',fill:true,tension:.3,pointRadius:0,borderWidth:2}]},options:{responsive:true,maintainAspectRatio:false,plugins:{legend:{labels:{color:'#8b90a8',font:{size:11}}}},scales:{x:{ticks:{color:'#5c6080',maxTicksLimit:12,font:{size:9}},grid:{color:'rgba(42,46,74,.5)'}},y:{ticks:{color:'#5c6080',font:{size:10},callback:v=>(v/10000).toFixed(0)+'万'},grid:{color:'rgba(42,46,74,.5)'}}},interaction:{intersect:false,mode:'index'}}});
+    const eqLabels=[],eqValues=[];
+    for(let i=0;i<r.equityCurve.length;i+=step){eqLabels.push(r.equityCurve[i].date);eqValues.push(r.equityCurve[i].equity);}
+    eqChart=new Chart(ctx,{type:'line',data:{labels:eqLabels,datasets:[{label:'权益曲线',data:eqValues,borderColor:'#6366f1',backgroundColor:'rgba(99,102,241,.08)',fill:true,tension:.3,pointRadius:0,borderWidth:2}]},options:{responsive:true,maintainAspectRatio:false,plugins:{legend:{labels:{color:'#8b90a8',font:{size:11}}}},scales:{x:{ticks:{color:'#5c6080',maxTicksLimit:12,font:{size:9}},grid:{color:'rgba(42,46,74,.5)'}},y:{ticks:{color:'#5c6080',font:{size:10},callback:v=>(v/10000).toFixed(0)+'万'},grid:{color:'rgba(42,46,74,.5)'}}},interaction:{intersect:false,mode:'index'}}});
 
     // 交易表
     const tb=document.querySelector('#bt-tb tbody');
@@ -0,0 +1,13 @@
+/**
+ * 量化交易智能体 — 回测 Web Worker
+ * 在后台线程执行 runBacktest，回测期间页面保持响应。
+ */
+importScripts('market_data.js', 'engine.js');
+
+self.onmessage = e => {
+    try {
+        self.postMessage({ ok: true, result: runBacktest(e.data) });
+    } catch (err) {
+        self.postMessage({ ok: false, error: err.message });
+    }
+};
@@ -134,6 +134,48 @@ const Strategies = {
     },
 };
 
+// ═══════════════════════════════════════════════════
+//  行情 / 策略结果缓存
+// ═══════════════════════════════════════════════════
+
+const CACHE_SIZE = 64;
+const barsCache = new Map();
+const strategyCache = new Map();
+
+/** 简单 LRU: 命中后移到队尾，超出容量时淘汰最早的条目 */
+function lruGet(cache, key, build) {
+    let value = cache.get(key);
+    if (value !== undefined) {
+        cache.delete(key);
+        cache.set(key, value);
+        return value;
+    }
+    value = build();
+    cache.set(key, value);
+    if (cache.size > CACHE_SIZE) cache.delete(cache.keys().next().value);
+    return value;
+}
+
+/** 区间内K线 (只读，调用方不得修改) */
+function getBars(symbol, startDate, endDate) {
+    return lruGet(barsCache, `${symbol}|${startDate}|${endDate}`, () =>
+        MARKET_DATA[symbol].data.filter(b => b.d >= startDate && b.d <= endDate)
+    );
+}
+
+// 策略输出只取决于 标的/区间/策略参数，跨次回测与分析复用 (仅调整阈值、止损止盈时无需重算指标)
+function computeStrategies(symbol, bars, startDate, endDate, maShort = 10, maLong = 30, rsiPeriod = 14) {
+    return lruGet(strategyCache, `${symbol}|${startDate}|${endDate}|${maShort}|${maLong}|${rsiPeriod}`, () => {
+        const closes = bars.map(b => b.c);
+        return {
+            closes,
+            ma: Strategies.maCrossover(closes, maShort, maLong),
+            rsi: Strategies.rsiStrategy(closes, rsiPeriod),
+            macd: Strategies.macdStrategy(closes),
+        };
+    });
+}
+
 // ═══════════════════════════════════════════════════
 //  回测引擎
 // ═══════════════════════════════════════════════════
@@ -154,7 +196,7 @@ function runBacktest(params) {
     const allBars = {};
     symbols.forEach(sym => {
         if (!MARKET_DATA[sym]) return;
-        allBars[sym] = MARKET_DATA[sym].data.filter(b => b.d >= startDate && b.d <= endDate);
+        allBars[sym] = getBars(sym, startDate, endDate);
     });
 
     // 所有日期
@@ -163,24 +205,22 @@ function runBacktest(params) {
     const allDates = [...dateSet].sort();
     if (allDates.length === 0) return { metrics: { error: '无数据' }, equityCurve: [], trades: [] };
 
-    // 计算各策略信号
+    // 计算各策略信号 (按 allDates 下标对齐，融合时直接按下标取值)
+    const dateIndex = new Map(allDates.map((d, i) => [d, i]));
     const stratSignals = {};
     Object.entries(allBars).forEach(([sym, bars]) => {
-        const closes = bars.map(b => b.c);
-        const ma = Strategies.maCrossover(closes, maShort, maLong);
-        const rsi = Strategies.rsiStrategy(closes, rsiPeriod);
-        const macd = Strategies.macdStrategy(closes);
+        const { ma, rsi, macd } = computeStrategies(sym, bars, startDate, endDate, maShort, maLong, rsiPeriod);
 
-        const dateMap = {};
+        const rows = new Array(allDates.length);
         bars.forEach((b, i) => {
-            dateMap[b.d] = {
+            rows[dateIndex.get(b.d)] = {
                 price: b.c,
                 ma: ma.signals[i], rsi: rsi.signals[i], macd: macd.signals[i],
                 rsiVal: rsi.rsi[i], shortMA: ma.shortMA[i], longMA: ma.longMA[i],
                 macdLine: macd.macdLine[i], macdSignal: macd.signalLine[i], macdHist: macd.histogram[i],
             };
         });
-        stratSignals[sym] = dateMap;
+        stratSignals[sym] = rows;
     });
 
     // 模拟交易
@@ -192,12 +232,14 @@ function runBacktest(params) {
     const trades = [];
     const equityCurve = [];
     const commRate = 0.001, slippage = 0.001;
+    const syms = Object.keys(allBars);
+    const wMaRsi = maWeight + rsiWeight, wAll = maWeight + rsiWeight + macdWeight;
 
     allDates.forEach((date, dateIdx) => {
         // 获取当日价格
         const prices = {};
-        Object.keys(allBars).forEach(sym => {
-            const s = stratSignals[sym][date];
+        syms.forEach(sym => {
+            const s = stratSignals[sym][dateIdx];
             if (s) prices[sym] = s.price;
         });
 
@@ -234,22 +276,22 @@ function runBacktest(params) {
         });
 
         // 信号融合 + 交易
-        Object.keys(allBars).forEach(sym => {
+        syms.forEach(sym => {
             if (!prices[sym]) return;
             // 冷却期
             if (lastTrade[sym] != null && dateIdx - lastTrade[sym] < cooldown) return;
 
             // 近5天信号窗口
+            const rows = stratSignals[sym];
             let combined = 0, totalW = 0, buyCount = 0, sellCount = 0;
             for (let lookback = 0; lookback < 5; lookback++) {
-                const ld = allDates[Math.max(0, dateIdx - lookback)];
-                const s = stratSignals[sym][ld];
+                const s = rows[Math.max(0, dateIdx - lookback)];
                 if (!s) continue;
                 // 取最近有信号的一天
                 if (s.ma !== 0 && !totalW) { combined += s.ma * maWeight; totalW += maWeight; s.ma > 0 ? buyCount++ : sellCount++; }
-                if (s.rsi !== 0 && totalW < maWeight + rsiWeight) { combined += s.rsi * rsiWeight; totalW += rsiWeight; s.rsi > 0 ? buyCount++ : sellCount++; }
-                if (s.macd !== 0 && totalW < maWeight + rsiWeight + macdWeight) { combined += s.macd * macdWeight; totalW += macdWeight; s.macd > 0 ? buyCount++ : sellCount++; }
-                if (totalW >= maWeight + rsiWeight + macdWeight - 0.01) break;
+                if (s.rsi !== 0 && totalW < wMaRsi) { combined += s.rsi * rsiWeight; totalW += rsiWeight; s.rsi > 0 ? buyCount++ : sellCount++; }
+                if (s.macd !== 0 && totalW < wAll) { combined += s.macd * macdWeight; totalW += macdWeight; s.macd > 0 ? buyCount++ : sellCount++; }
+                if (totalW >= wAll - 0.01) break;
             }
             if (totalW > 0) combined /= totalW;
 
@@ -292,10 +334,17 @@ function runBacktest(params) {
     // 计算绩效
     const finalEquity = equityCurve.length > 0 ? equityCurve[equityCurve.length - 1].equity : initialCapital;
     const totalReturn = (finalEquity - initialCapital) / initialCapital;
-    const sellTrades = trades.filter(t => t.side === 'sell');
-    const winning = sellTrades.filter(t => t.pnl > 0);
-    const losing = sellTrades.filter(t => t.pnl <= 0);
-    const winRate = sellTrades.length > 0 ? winning.length / sellTrades.length : 0;
+
+    // 单次遍历汇总成交统计
+    let buyCount = 0, sellCount = 0, winCount = 0, lossCount = 0, winSum = 0, lossSum = 0, commSum = 0;
+    trades.forEach(t => {
+        commSum += t.comm;
+        if (t.side === 'buy') { buyCount++; return; }
+        sellCount++;
+        if (t.pnl > 0) { winCount++; winSum += t.pnl; }
+        else { lossCount++; lossSum += t.pnl; }
+    });
+    const winRate = sellCount > 0 ? winCount / sellCount : 0;
 
     // 日收益率
     const dailyRet = [];
@@ -312,17 +361,17 @@ function runBacktest(params) {
     let peak = 0, maxDD = 0;
     equityCurve.forEach(e => { peak = Math.max(peak, e.equity); maxDD = Math.max(maxDD, (peak - e.equity) / peak); });
 
-    const avgWin = winning.length > 0 ? winning.reduce((s, t) => s + t.pnl, 0) / winning.length : 0;
-    const avgLoss = losing.length > 0 ? losing.reduce((s, t) => s + t.pnl, 0) / losing.length : 0;
-    const profitRatio = losing.length > 0 && avgLoss !== 0 ? Math.abs(avgWin / avgLoss) : 0;
+    const avgWin = winCount > 0 ? winSum / winCount : 0;
+    const avgLoss = lossCount > 0 ? lossSum / lossCount : 0;
+    const profitRatio = lossCount > 0 && avgLoss !== 0 ? Math.abs(avgWin / avgLoss) : 0;
 
     return {
         metrics: {
             initialCapital, finalEquity, totalReturn, annualReturn, annualVol, sharpe, maxDD,
-            totalTrades: trades.length, buyTrades: trades.filter(t => t.side === 'buy').length,
-            sellTrades: sellTrades.length, winningTrades: winning.length, losingTrades: losing.length,
+            totalTrades: trades.length, buyTrades: buyCount,
+            sellTrades: sellCount, winningTrades: winCount, losingTrades: lossCount,
             winRate, avgWin, avgLoss, profitRatio,
-            totalCommission: +trades.reduce((s, t) => s + t.comm, 0).toFixed(2),
+            totalCommission: +commSum.toFixed(2),
         },
         equityCurve,
         trades,
@@ -335,13 +384,9 @@ function runBacktest(params) {
 
 function analyzeSymbol(symbol, startDate, endDate) {
     if (!MARKET_DATA[symbol]) return null;
-    const bars = MARKET_DATA[symbol].data.filter(b => b.d >= startDate && b.d <= endDate);
+    const bars = getBars(symbol, startDate, endDate);
     if (bars.length === 0) return null;
-    const closes = bars.map(b => b.c);
-
-    const ma = Strategies.maCrossover(closes);
-    const rsi = Strategies.rsiStrategy(closes);
-    const macd = Strategies.macdStrategy(closes);
+    const { closes, ma, rsi, macd } = computeStrategies(symbol, bars, startDate, endDate);
 
     // 最新信号
     const last = bars.length - 1;
@@ -351,9 +396,8 @@ function analyzeSymbol(symbol, startDate, endDate) {
     const combined = (maStr * 0.4 + rsiStr * 0.3 + macdStr * 0.3);
     const signalType = combined >= 0.15 ? 'buy' : combined <= -0.15 ? 'sell' : 'hold';
 
-    // 最近60天数据
+    // 最近60天数据 (指标直接截取策略已在全区间算好的序列，无需重算且已越过预热期)
     const recent = bars.slice(-60);
-    const recentCloses = closes.slice(-60);
 
     return {
         symbol,
@@ -368,12 +412,12 @@ function analyzeSymbol(symbol, startDate, endDate) {
         ],
         kline: recent,
         indicators: {
-            sma10: Indicators.sma(recentCloses, 10),
-            sma30: Indicators.sma(recentCloses, Math.min(30, recentCloses.length)),
-            rsi: Indicators.rsi(recentCloses, 14),
-            macdLine: Indicators.macd(recentCloses).macdLine,
-            macdSignal: Indicators.macd(recentCloses).signalLine,
-            macdHist: Indicators.macd(recentCloses).histogram,
+            sma10: ma.shortMA.slice(-60),
+            sma30: ma.longMA.slice(-60),
+            rsi: rsi.rsi.slice(-60),
+            macdLine: macd.macdLine.slice(-60),
+            macdSignal: macd.signalLine.slice(-60),
+            macdHist: macd.histogram.slice(-60),
         },
     };
 }